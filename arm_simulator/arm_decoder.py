@@ -1,15 +1,163 @@
-import struct
+import numpy as np
+
+# Integer type ids for decoded instructions; INSTRUCTION_TYPES maps an id back to its name
+INSTR_MOV = 0
+INSTR_LDR = 1
+INSTR_STR = 2
+INSTR_ADD = 3
+INSTR_SUB = 4
+INSTR_MUL = 5
+INSTR_CMP = 6
+INSTR_AND = 7
+INSTR_ORR = 8
+INSTR_SUBNE = 9
+INSTR_ADDEQ = 10
+INSTR_LSL = 11
+INSTR_LSR = 12
+INSTR_ASR = 13
+INSTR_ROR = 14
+INSTR_B = 15
+INSTR_BL = 16
+INSTR_UNKNOWN_DATA_PROCESSING_IMM = 17
+INSTR_UNKNOWN_DATA_PROCESSING_REG = 18
+INSTR_UNKNOWN = 19
+INSTR_UNKNOWN_THUMB = 20
+INSTR_CMP_SUBNE = 21
+INSTR_CMP_ADDEQ = 22
+
+INSTRUCTION_TYPES = (
+    'MOV', 'LDR', 'STR', 'ADD', 'SUB', 'MUL', 'CMP', 'AND', 'ORR', 'SUBNE', 'ADDEQ',
+    'LSL', 'LSR', 'ASR', 'ROR', 'B', 'BL',
+    'UNKNOWN_DATA_PROCESSING_IMM', 'UNKNOWN_DATA_PROCESSING_REG', 'UNKNOWN', 'UNKNOWN_THUMB',
+    'CMP_SUBNE', 'CMP_ADDEQ',
+)
+TYPE_IDS = {name: type_id for type_id, name in enumerate(INSTRUCTION_TYPES)}
+
+# How operand2 is formed, fixed at decode time: an immediate, Rm shifted by a constant, or Rm shifted by Rs
+SHIFT_NONE = 0
+SHIFT_LSL_IMM = 1
+SHIFT_LSR_IMM = 2
+SHIFT_ASR_IMM = 3
+SHIFT_ROR_IMM = 4
+SHIFT_REGISTER = 5
+
+# Immediate operand2 for every 12-bit rotate_imm:imm8 field: imm8 rotated right by 2 * rotate_imm
+_ROT_IMM = np.zeros(4096, dtype=np.uint32)
+for _rotate in range(16):
+    for _imm8 in range(256):
+        _shift = 2 * _rotate
+        _ROT_IMM[(_rotate << 8) | _imm8] = ((_imm8 >> _shift) | (_imm8 << (32 - _shift))) & 0xFFFFFFFF if _shift else _imm8
+del _rotate, _imm8, _shift
+_ROT_IMM_LIST = _ROT_IMM.tolist()  # Plain ints for the scalar decoder
+
+# Data processing opcode -> instruction type, None where the opcode is not supported
+_OPC_NAMES = (
+    'AND', None, 'SUB', None, 'ADD', None, None, None,    # 0000-0111
+    None, None, 'CMP', None, 'ORR', 'MOV', None, None,    # 1000-1111
+)
+
+# Shift type bits -> standalone shift instruction type
+_SHIFT_NAMES = ('LSL', 'LSR', 'ASR', 'ROR')
+
+# Operand attributes in the order they are listed by ARMInstruction.operands
+_OPERAND_FIELDS = ('rd', 'rn', 'rm', 'rs', 'shift_amount', 'operand2', 'shift_type', 'offset')
+_SHIFT_OPERAND_FIELDS = ('rd', 'rm', 'rs', 'shift_amount', 'shift_type', 'rn')
+
+# Source templates for ARMInstruction.compile. Generated code works on the plain int register list
+# and masks results to 32 bits before they are stored. CPSR bits are N=0x80000000, Z=0x40000000,
+# C=0x20000000 and V=0x10000000, as in arm_executor.
+# Condition code -> test on the packed CPSR `c`; None for AL and 1111
+_CONDITION_SOURCE = (
+    "c & 0x40000000",                                       # EQ
+    "not c & 0x40000000",                                   # NE
+    "c & 0x20000000",                                       # CS/HS
+    "not c & 0x20000000",                                   # CC/LO
+    "c & 0x80000000",                                       # MI
+    "not c & 0x80000000",                                   # PL
+    "c & 0x10000000",                                       # VS
+    "not c & 0x10000000",                                   # VC
+    "c & 0x60000000 == 0x20000000",                         # HI
+    "c & 0x60000000 != 0x20000000",                         # LS
+    "c >> 31 == c >> 28 & 1",                               # GE
+    "c >> 31 != c >> 28 & 1",                               # LT
+    "not c & 0x40000000 and c >> 31 == c >> 28 & 1",        # GT
+    "c & 0x40000000 or c >> 31 != c >> 28 & 1",             # LE
+    None,                                                   # AL
+    None,                                                   # 1111 (unconditional)
+)
+# Shift type bits -> expression shifting Rm (`m`) by an amount
+_SHIFT_SOURCE = (
+    "m << {0} & 0xFFFFFFFF",                                # LSL
+    "m >> {0}",                                             # LSR
+    "((m ^ 0x80000000) - 0x80000000) >> {0} & 0xFFFFFFFF",  # ASR: sign-extend, then shift
+    "(m >> {0} | m << (32 - {0})) & 0xFFFFFFFF",            # ROR
+)
+# Result `v` = `a` (Rn) op `b` (operand2) for the arithmetic and logical types, with `w` the unmasked result
+_RESULT_SOURCE = {
+    INSTR_ADD: "w = a + b; v = w & 0xFFFFFFFF",
+    INSTR_ADDEQ: "w = a + b; v = w & 0xFFFFFFFF",
+    INSTR_SUB: "v = (a - b) & 0xFFFFFFFF",
+    INSTR_SUBNE: "v = (a - b) & 0xFFFFFFFF",
+    INSTR_CMP: "v = (a - b) & 0xFFFFFFFF",
+    INSTR_AND: "v = a & b",
+    INSTR_ORR: "v = a | b",
+}
+_NZ_SOURCE = "cpu.cpsr = (cpu.cpsr & 0x30000000) | (v & 0x80000000) | (0x40000000 if v == 0 else 0)"
+_ADD_FLAGS_SOURCE = ("cpu.cpsr = ((v & 0x80000000) | (0x40000000 if v == 0 else 0) | (0x20000000 if w > 0xFFFFFFFF else 0)"
+                     " | (0x10000000 if ~(a ^ b) & (a ^ v) & 0x80000000 else 0))")
+_SUB_FLAGS_SOURCE = ("cpu.cpsr = ((v & 0x80000000) | (0x40000000 if v == 0 else 0) | (0x20000000 if a >= b else 0)"
+                     " | (0x10000000 if (a ^ b) & (a ^ v) & 0x80000000 else 0))")
+_FLAGS_SOURCE = {
+    INSTR_ADD: _ADD_FLAGS_SOURCE, INSTR_ADDEQ: _ADD_FLAGS_SOURCE,
+    INSTR_SUB: _SUB_FLAGS_SOURCE, INSTR_SUBNE: _SUB_FLAGS_SOURCE, INSTR_CMP: _SUB_FLAGS_SOURCE,
+}
+# Compiled functions keyed by binary word, so repeated words share one function and are only generated once.
+# The decoded fields, and so the generated source, depend only on the word.
+_COMPILED = {}
+
+def _interpreted(instruction):
+    # Fallback for instructions without a specialised form: run them through ARMCpu.execute_instruction
+    return lambda cpu: cpu.execute_instruction(instruction)
 
 class ARMInstruction:
+    __slots__ = (
+        'binary_word', 'instruction_type', 'type_id', 'opcode', 'condition_code', 'set_flags', 'l_bit',
+        'rd', 'rn', 'rm', 'rs', 'operand2', 'shift_type', 'shift_amount', 'shift_kind', 'offset',
+    )
+
     def __init__(self, binary_word):
         self.binary_word = binary_word
         self.instruction_type = None
+        self.type_id = None
         self.opcode = None
-        self.operands = {}
         self.condition_code = None
         self.set_flags = False
+        self.l_bit = None
+        # Operand fields stay None when the instruction does not use them
+        self.rd = None
+        self.rn = None
+        self.rm = None
+        self.rs = None
+        self.operand2 = None
+        self.shift_type = None
+        self.shift_amount = None
+        self.shift_kind = SHIFT_NONE
+        self.offset = None
+
+    @property
+    def operands(self):
+        # Built on demand for display; the executor reads the operand attributes directly
+        if INSTR_LSL <= self.type_id <= INSTR_ROR:
+            fields = _SHIFT_OPERAND_FIELDS
+        else:
+            fields = _OPERAND_FIELDS
+        return {name: getattr(self, name) for name in fields if getattr(self, name) is not None}
 
     def decode(self):
+        self._decode_fields()
+        self.type_id = TYPE_IDS[self.instruction_type]
+
+    def _decode_fields(self):
         self.condition_code = (self.binary_word >> 28) & 0xF
 
         # Check for Multiply (MUL) instruction first as it has a distinct pattern
@@ -21,7 +169,6 @@ class ARMInstruction:
             self.rd = (self.binary_word >> 16) & 0xF
             self.rm = self.binary_word & 0xF
             self.rs = (self.binary_word >> 8) & 0xF
-            self.operands = {'rd': self.rd, 'rm': self.rm, 'rs': self.rs}
             return
 
         # Check for Data Processing Instructions (including MOV, ADD, SUB, AND, ORR, CMP, TST, TEQ, CMN)
@@ -34,99 +181,37 @@ class ARMInstruction:
             self.rd = (self.binary_word >> 12) & 0xF
 
             # Check I bit (bit 25) for immediate vs register operand
-            if (self.binary_word >> 25) & 0x1: # Immediate operand
-                # Immediate value is 8-bit immediate rotated right by 2 * rotate_imm
-                rotate_imm = (self.binary_word >> 8) & 0xF
-                imm8 = self.binary_word & 0xFF
-                # Perform ROR on imm8 by 2 * rotate_imm
-                self.operand2 = (imm8 >> (2 * rotate_imm)) | (imm8 << (32 - (2 * rotate_imm))) & 0xFFFFFFFF
-                self.operands = {'rd': self.rd, 'rn': self.rn, 'operand2': self.operand2}
-
-                # Map opcodes to instruction types for Data Processing Immediate
-                if self.opcode == 0b0100: # ADD
-                    self.instruction_type = 'ADD'
-                elif self.opcode == 0b0010: # SUB
-                    self.instruction_type = 'SUB'
-                elif self.opcode == 0b1101: # MOV
-                    self.instruction_type = 'MOV'
-                elif self.opcode == 0b1010: # CMP (always sets flags)
-                    self.instruction_type = 'CMP'
-                    self.set_flags = True
-                elif self.opcode == 0b0000: # AND
-                    self.instruction_type = 'AND'
-                elif self.opcode == 0b1100: # ORR
-                    self.instruction_type = 'ORR'
-                else:
-                    self.instruction_type = 'UNKNOWN_DATA_PROCESSING_IMM'
+            is_immediate = (self.binary_word >> 25) & 0x1
+            if is_immediate: # Immediate operand
+                # Immediate value is 8-bit immediate rotated right by 2 * rotate_imm, looked up precomputed
+                self.operand2 = _ROT_IMM_LIST[self.binary_word & 0xFFF]
 
             else: # Register operand (shifted register)
                 self.rm = self.binary_word & 0xF
                 shift_type_bits = (self.binary_word >> 5) & 0b11
-                
+                self.shift_type = shift_type_bits
+
                 # Check bit 4 for immediate shift (0) or register shift (1)
                 if not ((self.binary_word >> 4) & 0x1): # Immediate shift amount
-                    shift_amount = (self.binary_word >> 7) & 0b11111
-                    
-                    # Special case for ROR #Imm: MOV Rd, Rm, ROR #Imm where Rm is Rd
-                    # This is how `ROR Rd, #Imm` is encoded.
-                    if self.opcode == 0b1101 and shift_type_bits == 0b11 and self.rn == 0 and self.rm == self.rd:
-                        self.instruction_type = 'ROR'
-                        self.operands = {'rd': self.rd, 'rm': self.rm, 'shift_amount': shift_amount, 'shift_type': shift_type_bits, 'rn': 0}
-                        return
-
-                    # Check for standalone shift instructions (Rn is R0, opcode is MOV)
-                    # This is a special case where MOV Rd, Rm, Shift #Imm is a shift instruction
-                    if self.rn == 0 and self.opcode == 0b1101: # MOV
-                        if shift_type_bits == 0b00: # LSL
-                            self.instruction_type = 'LSL'
-                        elif shift_type_bits == 0b01: # LSR
-                            self.instruction_type = 'LSR'
-                        elif shift_type_bits == 0b10: # ASR
-                            self.instruction_type = 'ASR'
-                        elif shift_type_bits == 0b11: # ROR
-                            self.instruction_type = 'ROR'
-                        self.operands = {'rd': self.rd, 'rm': self.rm, 'shift_amount': shift_amount, 'shift_type': shift_type_bits, 'rn': 0}
-                        return
-
-                    # If not a standalone shift, it's a data processing instruction with immediate shift
-                    self.operands = {'rd': self.rd, 'rn': self.rn, 'rm': self.rm, 'shift_amount': shift_amount, 'shift_type': shift_type_bits}
-
+                    self.shift_amount = (self.binary_word >> 7) & 0b11111
+                    self.shift_kind = SHIFT_LSL_IMM + shift_type_bits
                 else: # Register-specified shift amount
-                    rs = (self.binary_word >> 8) & 0xF
-                    
-                    # Check for standalone shift instructions (Rn is R0, opcode is MOV)
-                    # This is a special case where MOV Rd, Rm, Shift Rs is a shift instruction
-                    if self.rn == 0 and self.opcode == 0b1101: # MOV
-                        if shift_type_bits == 0b00: # LSL
-                            self.instruction_type = 'LSL'
-                        elif shift_type_bits == 0b01: # LSR
-                            self.instruction_type = 'LSR'
-                        elif shift_type_bits == 0b10: # ASR
-                            self.instruction_type = 'ASR'
-                        elif shift_type_bits == 0b11: # ROR
-                            self.instruction_type = 'ROR'
-                        self.operands = {'rd': self.rd, 'rm': self.rm, 'rs': rs, 'shift_type': shift_type_bits, 'rn': 0}
-                        return
-
-                    # If not a standalone shift, it's a data processing instruction with register shift
-                    self.operands = {'rd': self.rd, 'rn': self.rn, 'rm': self.rm, 'rs': rs, 'shift_type': shift_type_bits}
-
-                # Map opcodes to instruction types for Data Processing Register
-                if self.opcode == 0b0100: # ADD
-                    self.instruction_type = 'ADD'
-                elif self.opcode == 0b0010: # SUB
-                    self.instruction_type = 'SUB'
-                elif self.opcode == 0b1101: # MOV
-                    self.instruction_type = 'MOV'
-                elif self.opcode == 0b1010: # CMP (always sets flags)
-                    self.instruction_type = 'CMP'
-                    self.set_flags = True
-                elif self.opcode == 0b0000: # AND
-                    self.instruction_type = 'AND'
-                elif self.opcode == 0b1100: # ORR
-                    self.instruction_type = 'ORR'
-                else:
-                    self.instruction_type = 'UNKNOWN_DATA_PROCESSING_REG'
+                    self.rs = (self.binary_word >> 8) & 0xF
+                    self.shift_kind = SHIFT_REGISTER
+
+                # Check for standalone shift instructions (Rn is R0, opcode is MOV)
+                # MOV Rd, Rm, Shift #Imm / Shift Rs is a shift instruction; `ROR Rd, #Imm` is encoded as
+                # MOV Rd, Rd, ROR #Imm and lands here too
+                if self.rn == 0 and self.opcode == 0b1101: # MOV
+                    self.instruction_type = _SHIFT_NAMES[shift_type_bits]
+                    return
+
+            # Map opcodes to instruction types for Data Processing (immediate and register forms)
+            self.instruction_type = _OPC_NAMES[self.opcode]
+            if self.instruction_type is None:
+                self.instruction_type = 'UNKNOWN_DATA_PROCESSING_IMM' if is_immediate else 'UNKNOWN_DATA_PROCESSING_REG'
+            elif self.opcode == 0b1010: # CMP (always sets flags)
+                self.set_flags = True
 
             # Handle conditional instructions (SUBNE, ADDEQ) - these override the base instruction type
             if self.condition_code == 0b0001 and self.instruction_type == 'SUB': # NE
@@ -148,7 +233,6 @@ class ARMInstruction:
                 self.instruction_type = 'LDR'
             else:
                 self.instruction_type = 'STR'
-            self.operands = {'rd': self.rd, 'rn': self.rn, 'offset': self.offset}
             return
 
         # Branch (B, BL)
@@ -162,7 +246,6 @@ class ARMInstruction:
                 self.instruction_type = 'BL'
             else:
                 self.instruction_type = 'B'
-            self.operands = {'offset': self.offset}
             return
 
         self.instruction_type = 'UNKNOWN'
@@ -176,26 +259,250 @@ class ARMInstruction:
             operand_str = ', '.join([f'{k}: {v}' for k, v in self.operands.items()])
             return f"Type: {self.instruction_type}, Cond: {self.condition_code:X}, Set Flags: {self.set_flags}, Operands: {{{operand_str}}}"
 
-def decode_instructions(binary_data):
-    instructions = []
-    for i in range(0, len(binary_data), 4):
-        word_bytes = binary_data[i:i+4]
-        if len(word_bytes) == 4:
-            binary_word = struct.unpack('>I', word_bytes)[0]
+    def compile(self):
+        # Specialise this instruction into a function of the CPU with its registers and immediates
+        # baked in. Memory, branch and unknown instructions fall back to the interpreter.
+        # Compiled functions skip failed conditions without logging them.
+        function = _COMPILED.get(self.binary_word)
+        if function is None:
+            source = self._source()
+            if source is None:
+                function = _interpreted(self)
+            else:
+                namespace = {}
+                exec(compile(source, f"<{self.instruction_type} {self.binary_word:08X}>", 'exec'), namespace)
+                function = namespace['f']
+            _COMPILED[self.binary_word] = function
+        return function
+
+    def _operand2_source(self):
+        # Setup lines and the expression for operand2
+        if self.shift_kind == SHIFT_NONE:
+            return [], str(self.operand2)
+        lines = [f"m = r[{self.rm}]"]
+        if self.shift_kind == SHIFT_REGISTER: # Shift amount comes from Rs, masked to 0-31
+            lines.append(f"s = r[{self.rs}] & 0x1F")
+            return lines, _SHIFT_SOURCE[self.shift_type].format('s')
+        return lines, _SHIFT_SOURCE[self.shift_kind - SHIFT_LSL_IMM].format(self.shift_amount)
+
+    def _source(self):
+        type_id = self.type_id
+        if type_id == INSTR_MUL:
+            body = [f"v = r[{self.rm}] * r[{self.rs}] & 0xFFFFFFFF", f"r[{self.rd}] = v"]
+            if self.set_flags:
+                body.append(_NZ_SOURCE)
+        elif type_id == INSTR_MOV or INSTR_LSL <= type_id <= INSTR_ROR:
+            body, operand2 = self._operand2_source()
+            body += [f"v = {operand2}", f"r[{self.rd}] = v"]
+            if self.set_flags:
+                body.append(_NZ_SOURCE)
+        elif type_id in _RESULT_SOURCE:
+            body, operand2 = self._operand2_source()
+            body += [f"a = r[{self.rn}]", f"b = {operand2}", _RESULT_SOURCE[type_id]]
+            if type_id != INSTR_CMP:
+                body.append(f"r[{self.rd}] = v")
+            if self.set_flags:
+                body.append(_FLAGS_SOURCE.get(type_id, _NZ_SOURCE))
+        else:
+            return None
+
+        lines = ["def f(cpu):", "    r = cpu.registers"]
+        condition = _CONDITION_SOURCE[self.condition_code]
+        if condition is not None:
+            lines += ["    c = cpu.cpsr", f"    if not ({condition}):", "        return"]
+        lines += ["    " + line for line in body]
+        return "\n".join(lines) + "\n"
+
+# Conditional instruction type id -> type id of its fused CMP super-instruction
+_FUSED_TYPE_IDS = {INSTR_SUBNE: INSTR_CMP_SUBNE, INSTR_ADDEQ: INSTR_CMP_ADDEQ}
+
+class FusedInstruction:
+    # Super-instruction for a CMP followed by a SUBNE/ADDEQ that consumes its flags.
+    # Both halves are dispatched by a single executor handler.
+    __slots__ = ('compare', 'conditional', 'instruction_type', 'type_id', 'condition_code')
+
+    def __init__(self, compare, conditional):
+        self.compare = compare
+        self.conditional = conditional
+        self.type_id = _FUSED_TYPE_IDS[conditional.type_id]
+        self.instruction_type = INSTRUCTION_TYPES[self.type_id]
+        self.condition_code = compare.condition_code
+
+    def __str__(self):
+        return f"Type: {self.instruction_type}, Fused: [{self.compare}] + [{self.conditional}]"
+
+    def compile(self):
+        return _interpreted(self)
+
+def fuse_instructions(instructions):
+    # One forward pass that folds each (CMP, SUBNE/ADDEQ) pair into a FusedInstruction.
+    # Only unconditional CMPs are fused, so the conditional half never depends on a skipped compare.
+    fused = []
+    i = 0
+    while i < len(instructions):
+        instruction = instructions[i]
+        if (instruction.type_id == INSTR_CMP and instruction.condition_code == 0b1110
+                and i + 1 < len(instructions)
+                and instructions[i + 1].type_id in _FUSED_TYPE_IDS):
+            fused.append(FusedInstruction(instruction, instructions[i + 1]))
+            i += 2
+        else:
+            fused.append(instruction)
+            i += 1
+    return fused
+
+def decode_stream(chunks):
+    # Yield decoded instructions from an iterable of byte chunks (or a single bytes object) as they are
+    # needed. Words may straddle chunk boundaries; a trailing partial word is ignored.
+    if isinstance(chunks, (bytes, bytearray, memoryview)):
+        chunks = (chunks,)
+    pending = b''
+    for chunk in chunks:
+        data = pending + chunk if pending else chunk
+        usable = len(data) - len(data) % 4
+        # Parse every complete big-endian word of the chunk in one call
+        for binary_word in np.frombuffer(data, dtype='>u4', count=usable // 4).tolist():
             instruction = ARMInstruction(binary_word)
             instruction.decode()
-            instructions.append(instruction)
+            yield instruction
+        pending = bytes(data[usable:])
+
+def decode_instructions(binary_data, fuse=False):
+    instructions = list(decode_stream(binary_data))
+    if fuse:
+        instructions = fuse_instructions(instructions)
     return instructions
 
+def compile_instructions(instructions):
+    # Specialised functions for a decoded program; run them in order with `for f in compiled: f(cpu)`
+    return [instruction.compile() for instruction in instructions]
+
+# Data processing opcode -> type id, -1 where the opcode is not supported
+_DP_OPCODE_TYPE_IDS = np.array([TYPE_IDS[name] if name else -1 for name in _OPC_NAMES], dtype=np.int32)
+
+# Shift type bits -> type id of the standalone shift instruction
+_SHIFT_TYPE_IDS = np.array([INSTR_LSL, INSTR_LSR, INSTR_ASR, INSTR_ROR], dtype=np.int32)
+
+def decode_instructions_vectorized(binary_data):
+    # Decode the whole binary at once into one array per field (structure of arrays).
+    # Field extraction mirrors ARMInstruction.decode; unused fields are set to -1.
+    words = np.frombuffer(binary_data, dtype='>u4', count=len(binary_data) // 4).astype(np.uint32)
+
+    cond = (words >> 28) & 0xF
+    top4 = (words >> 24) & 0xF
+    low4 = (words >> 4) & 0xF
+    opcode = (words >> 21) & 0xF
+    field_rn = ((words >> 16) & 0xF).astype(np.int32)
+    field_rd = ((words >> 12) & 0xF).astype(np.int32)
+    field_rs = ((words >> 8) & 0xF).astype(np.int32)
+    field_rm = (words & 0xF).astype(np.int32)
+    s_bit = ((words >> 20) & 0x1).astype(bool)
+
+    # Instruction classes, checked in the same order as the scalar decoder
+    is_mul = (top4 == 0b0000) & (low4 == 0b1001)
+    is_dp = (((words >> 26) & 0b11) == 0b00) & ~is_mul
+    is_mem = ((words >> 26) & 0b11) == 0b01
+    is_branch = ((words >> 25) & 0b111) == 0b101
+    l_bit = ((words >> 20) & 0x1).astype(bool)
+    link_bit = ((words >> 24) & 0x1).astype(bool)
+
+    # Data processing operand forms
+    is_imm = is_dp & (((words >> 25) & 0x1) == 1)
+    is_reg = is_dp & ~is_imm
+    is_reg_shift = is_reg & (((words >> 4) & 0x1) == 1)
+    is_imm_shift = is_reg & ~is_reg_shift
+    shift_type_bits = ((words >> 5) & 0b11).astype(np.int32)
+    is_standalone_shift = is_reg & (opcode == 0b1101) & (field_rn == 0)
+
+    dp_type = _DP_OPCODE_TYPE_IDS[opcode]
+    dp_type = np.where(dp_type >= 0, dp_type,
+                       np.where(is_imm, INSTR_UNKNOWN_DATA_PROCESSING_IMM, INSTR_UNKNOWN_DATA_PROCESSING_REG))
+    dp_type = np.where(is_standalone_shift, _SHIFT_TYPE_IDS[shift_type_bits], dp_type)
+    dp_type = np.where((cond == 0b0001) & (dp_type == INSTR_SUB), INSTR_SUBNE, dp_type)
+    dp_type = np.where((cond == 0b0000) & (dp_type == INSTR_ADD), INSTR_ADDEQ, dp_type)
+
+    type_id = np.select(
+        [is_mul, is_dp, is_mem, is_branch],
+        [INSTR_MUL, dp_type, np.where(l_bit, INSTR_LDR, INSTR_STR), np.where(link_bit, INSTR_BL, INSTR_B)],
+        default=INSTR_UNKNOWN,
+    ).astype(np.int32)
+
+    operand2 = np.where(is_imm, _ROT_IMM[words & 0xFFF].astype(np.int64), -1)
+
+    unused = np.int32(-1)
+    rd = np.where(is_mul, field_rn, np.where(is_dp | is_mem, field_rd, unused))
+    rn = np.where(is_standalone_shift, 0, np.where(is_dp | is_mem, field_rn, unused))
+    rm = np.where(is_mul | is_reg, field_rm, unused)
+    rs = np.where(is_mul | is_reg_shift, field_rs, unused)
+    shift_type = np.where(is_reg, shift_type_bits, unused)
+    shift_amount = np.where(is_imm_shift, ((words >> 7) & 0b11111).astype(np.int32), unused)
+    shift_kind = np.where(is_imm_shift, SHIFT_LSL_IMM + shift_type_bits,
+                          np.where(is_reg_shift, SHIFT_REGISTER, SHIFT_NONE)).astype(np.int32)
+    offset = np.where(is_mem, (words & 0xFFF).astype(np.int32),
+                      np.where(is_branch, (words & 0xFFFFFF).astype(np.int32), unused))
+    set_flags = np.where(is_mul | is_dp, s_bit | (type_id == INSTR_CMP), False)
+
+    return {
+        'word': words,
+        'type_id': type_id,
+        'cond': cond.astype(np.int32),
+        'set_flags': set_flags,
+        'rd': rd,
+        'rn': rn,
+        'rm': rm,
+        'rs': rs,
+        'operand2': operand2,
+        'shift_type': shift_type,
+        'shift_amount': shift_amount,
+        'shift_kind': shift_kind,
+        'offset': offset,
+    }
+
+class DecodedProgram:
+    # Sequence over the arrays from decode_instructions_vectorized.
+    # Rows are only wrapped in ARMInstruction objects when they are accessed.
+    def __init__(self, binary_data):
+        self.fields = decode_instructions_vectorized(binary_data)
+
+    def __len__(self):
+        return len(self.fields['word'])
+
+    def __getitem__(self, index):
+        fields = self.fields
+        instruction = ARMInstruction(int(fields['word'][index]))
+        instruction.type_id = int(fields['type_id'][index])
+        instruction.instruction_type = INSTRUCTION_TYPES[instruction.type_id]
+        instruction.condition_code = int(fields['cond'][index])
+        instruction.set_flags = bool(fields['set_flags'][index])
+        instruction.shift_kind = int(fields['shift_kind'][index])
+        for name in _OPERAND_FIELDS:
+            value = int(fields[name][index])
+            if value >= 0:
+                setattr(instruction, name, value)
+        return instruction
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
 class ThumbInstruction(ARMInstruction):
+    __slots__ = ()
+
     def __init__(self, binary_word):
         super().__init__(binary_word)
         self.binary_word = binary_word & 0xFFFF
 
     def decode(self):
         self.instruction_type = 'UNKNOWN_THUMB'
-        self.operands = {'binary_word': self.binary_word}
+        self.type_id = INSTR_UNKNOWN_THUMB
+
+    def compile(self):
+        # Not cached: a 16-bit Thumb word would collide with the ARM word of the same value
+        return _interpreted(self)
 
+    @property
+    def operands(self):
+        return {'binary_word': self.binary_word}
 
     def __str__(self):
         return f"Type: {self.instruction_type}, Operands: {self.operands}"
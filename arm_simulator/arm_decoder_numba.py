@@ -0,0 +1,141 @@
+from collections import namedtuple
+
+import numpy as np
+from numba import njit
+
+from arm_decoder import (
+    INSTRUCTION_TYPES, INSTR_MOV, INSTR_LDR, INSTR_STR, INSTR_ADD, INSTR_SUB, INSTR_MUL, INSTR_CMP,
+    INSTR_AND, INSTR_ORR, INSTR_SUBNE, INSTR_ADDEQ, INSTR_LSL,
+    INSTR_B, INSTR_BL, INSTR_UNKNOWN_DATA_PROCESSING_IMM, INSTR_UNKNOWN_DATA_PROCESSING_REG, INSTR_UNKNOWN,
+    SHIFT_NONE, SHIFT_LSL_IMM, SHIFT_REGISTER, _ROT_IMM,
+)
+
+# Same field layout as arm_decoder.decode_instructions_vectorized; unused fields are -1
+FIELD_NAMES = (
+    'type_id', 'cond', 'rd', 'rn', 'rm', 'rs', 'operand2', 'shift_type', 'shift_amount', 'shift_kind', 'offset',
+    'set_flags',
+)
+
+# Lightweight stand-in for ARMInstruction, carrying the attributes ARMCpu reads
+DecodedInstruction = namedtuple('DecodedInstruction', (
+    'binary_word', 'instruction_type', 'type_id', 'condition_code', 'set_flags', 'shift_kind',
+    'rd', 'rn', 'rm', 'rs', 'operand2', 'shift_type', 'shift_amount', 'offset',
+))
+
+@njit(cache=True)
+def _dp_type_id(opcode, is_immediate):
+    # Map opcodes to instruction types for Data Processing
+    if opcode == 0b0100: # ADD
+        return INSTR_ADD
+    elif opcode == 0b0010: # SUB
+        return INSTR_SUB
+    elif opcode == 0b1101: # MOV
+        return INSTR_MOV
+    elif opcode == 0b1010: # CMP
+        return INSTR_CMP
+    elif opcode == 0b0000: # AND
+        return INSTR_AND
+    elif opcode == 0b1100: # ORR
+        return INSTR_ORR
+    elif is_immediate:
+        return INSTR_UNKNOWN_DATA_PROCESSING_IMM
+    return INSTR_UNKNOWN_DATA_PROCESSING_REG
+
+@njit(cache=True, boundscheck=False)
+def decode_all(words):
+    # Compiled port of ARMInstruction.decode over a contiguous uint32 array
+    n = words.shape[0]
+    type_ids = np.full(n, INSTR_UNKNOWN, dtype=np.int32)
+    cond = np.empty(n, dtype=np.int32)
+    rd = np.full(n, -1, dtype=np.int32)
+    rn = np.full(n, -1, dtype=np.int32)
+    rm = np.full(n, -1, dtype=np.int32)
+    rs = np.full(n, -1, dtype=np.int32)
+    operand2 = np.full(n, -1, dtype=np.int64)
+    shift_type = np.full(n, -1, dtype=np.int32)
+    shift_amount = np.full(n, -1, dtype=np.int32)
+    shift_kind = np.full(n, SHIFT_NONE, dtype=np.int32)
+    offset = np.full(n, -1, dtype=np.int32)
+    set_flags = np.zeros(n, dtype=np.bool_)
+
+    for i in range(n):
+        word = np.uint32(words[i])
+        cond[i] = (word >> 28) & 0xF
+
+        # Multiply: bits 27-24 are 0000, bits 7-4 are 1001
+        if ((word >> 24) & 0xF) == 0b0000 and ((word >> 4) & 0xF) == 0b1001:
+            type_ids[i] = INSTR_MUL
+            set_flags[i] = ((word >> 20) & 0x1) != 0
+            rd[i] = (word >> 16) & 0xF
+            rm[i] = word & 0xF
+            rs[i] = (word >> 8) & 0xF
+            continue
+
+        # Data Processing: bits 27-26 are 00
+        if ((word >> 26) & 0b11) == 0b00:
+            set_flags[i] = ((word >> 20) & 0x1) != 0
+            opcode = (word >> 21) & 0xF
+            rn[i] = (word >> 16) & 0xF
+            rd[i] = (word >> 12) & 0xF
+
+            if (word >> 25) & 0x1: # Immediate operand
+                # imm8 rotated right by 2 * rotate_imm, looked up precomputed
+                operand2[i] = _ROT_IMM[word & 0xFFF]
+                type_id = _dp_type_id(opcode, True)
+            else: # Register operand (shifted register)
+                rm[i] = word & 0xF
+                shift_type[i] = (word >> 5) & 0b11
+                if (word >> 4) & 0x1: # Register-specified shift amount
+                    rs[i] = (word >> 8) & 0xF
+                    shift_kind[i] = SHIFT_REGISTER
+                else: # Immediate shift amount
+                    shift_amount[i] = (word >> 7) & 0b11111
+                    shift_kind[i] = SHIFT_LSL_IMM + shift_type[i]
+
+                # Standalone shift instruction: MOV Rd, Rm, <shift> with Rn as R0
+                if rn[i] == 0 and opcode == 0b1101:
+                    type_ids[i] = INSTR_LSL + shift_type[i]
+                    continue
+                type_id = _dp_type_id(opcode, False)
+
+            if type_id == INSTR_CMP: # CMP always sets flags
+                set_flags[i] = True
+            elif type_id == INSTR_SUB and cond[i] == 0b0001: # NE
+                type_id = INSTR_SUBNE
+            elif type_id == INSTR_ADD and cond[i] == 0b0000: # EQ
+                type_id = INSTR_ADDEQ
+            type_ids[i] = type_id
+            continue
+
+        # Load/Store: bits 27-26 are 01
+        if ((word >> 26) & 0b11) == 0b01:
+            rn[i] = (word >> 16) & 0xF
+            rd[i] = (word >> 12) & 0xF
+            offset[i] = word & 0xFFF
+            type_ids[i] = INSTR_LDR if (word >> 20) & 0x1 else INSTR_STR
+            continue
+
+        # Branch: bits 27-25 are 101
+        if ((word >> 25) & 0b111) == 0b101:
+            offset[i] = word & 0xFFFFFF
+            type_ids[i] = INSTR_BL if (word >> 24) & 0x1 else INSTR_B
+
+    return type_ids, cond, rd, rn, rm, rs, operand2, shift_type, shift_amount, shift_kind, offset, set_flags
+
+def decode_instructions(binary_data, as_tuples=False):
+    # Returns a dict of field arrays, or a list of DecodedInstruction tuples when as_tuples is set
+    words = np.frombuffer(binary_data, dtype='>u4', count=len(binary_data) // 4).astype(np.uint32)
+    fields = dict(zip(FIELD_NAMES, decode_all(words)))
+    fields['word'] = words
+    if not as_tuples:
+        return fields
+
+    columns = {name: array.tolist() for name, array in fields.items()}
+    instructions = []
+    for i, type_id in enumerate(columns['type_id']):
+        operand_values = [columns[name][i] for name in DecodedInstruction._fields[6:]]
+        instructions.append(DecodedInstruction(
+            columns['word'][i], INSTRUCTION_TYPES[type_id], type_id, columns['cond'][i], columns['set_flags'][i],
+            columns['shift_kind'][i], *[value if value >= 0 else None for value in operand_values],
+        ))
+    return instructions
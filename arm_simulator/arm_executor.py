@@ -1,243 +1,294 @@
-import struct
+import logging
+
+import numpy as np
+from arm_decoder import (
+    INSTRUCTION_TYPES, INSTR_MOV, INSTR_LDR, INSTR_STR, INSTR_ADD, INSTR_SUB, INSTR_MUL, INSTR_CMP,
+    INSTR_AND, INSTR_ORR, INSTR_SUBNE, INSTR_ADDEQ, INSTR_LSL, INSTR_LSR, INSTR_ASR, INSTR_ROR,
+    INSTR_B, INSTR_BL, INSTR_CMP_SUBNE, INSTR_CMP_ADDEQ, SHIFT_NONE, SHIFT_LSL_IMM, SHIFT_REGISTER,
+)
+
+# Per-instruction trace messages; skipped instructions are logged at DEBUG level
+log = logging.getLogger('arm_sim')
+
+def _shift_asr(value, amount):
+    # ASR preserves the sign bit: sign-extend bit 31, shift arithmetically, then mask back to 32 bits
+    return (((value ^ 0x80000000) - 0x80000000) >> amount) & 0xFFFFFFFF
+
+# Shift functions indexed by shift type bits (LSL, LSR, ASR, ROR); each takes a 32-bit int value and an amount
+_SHIFTS = (
+    lambda value, amount: (value << amount) & 0xFFFFFFFF,
+    lambda value, amount: value >> amount,
+    _shift_asr,
+    # ROR: (value >> shift) | (value << (32 - shift)), masked to 32 bits
+    lambda value, amount: ((value >> amount) | (value << (32 - amount))) & 0xFFFFFFFF,
+)
+
+# CPSR condition flag bits (bits 31..28)
+N_BIT = 1 << 31  # Negative
+Z_BIT = 1 << 30  # Zero
+C_BIT = 1 << 29  # Carry
+V_BIT = 1 << 28  # Overflow
+
+# Condition code -> check on the packed CPSR, indexed by the instruction's 4-bit condition field
+_CONDITION_CHECKS = (
+    lambda c: c & Z_BIT != 0,                                           # EQ
+    lambda c: c & Z_BIT == 0,                                           # NE
+    lambda c: c & C_BIT != 0,                                           # CS/HS
+    lambda c: c & C_BIT == 0,                                           # CC/LO
+    lambda c: c & N_BIT != 0,                                           # MI
+    lambda c: c & N_BIT == 0,                                           # PL
+    lambda c: c & V_BIT != 0,                                           # VS
+    lambda c: c & V_BIT == 0,                                           # VC
+    lambda c: c & (C_BIT | Z_BIT) == C_BIT,                             # HI
+    lambda c: c & (C_BIT | Z_BIT) != C_BIT,                             # LS
+    lambda c: (c >> 31) & 1 == (c >> 28) & 1,                           # GE
+    lambda c: (c >> 31) & 1 != (c >> 28) & 1,                           # LT
+    lambda c: c & Z_BIT == 0 and (c >> 31) & 1 == (c >> 28) & 1,        # GT
+    lambda c: c & Z_BIT != 0 or (c >> 31) & 1 != (c >> 28) & 1,         # LE
+    lambda c: True,                                                     # AL
+    lambda c: True,                                                     # 1111 (unconditional)
+)
 
 class ARMCpu:
+    # Format templates for __str__, built once
+    _REG_FMT = ", ".join(f"R{i}: {{:08X}}" for i in range(16))
+    _CPSR_FMT = "N: {}, Z: {}, C: {}, V: {}"
+
     def __init__(self):
-        self.registers = [0] * 16  # R0-R15, R15 is PC
-        self.cpsr = {
-            'N': 0,  # Negative
-            'Z': 0,  # Zero
-            'C': 0,  # Carry
-            'V': 0   # Overflow
-        }
-        self.memory = bytearray(1024)  # 1KB of memory for now
-
-    def _update_flags(self, result, op1=None, op2=None, carry_out=None, overflow=None):
-        # Ensure result is treated as a 32-bit unsigned integer for N and Z flags
-        result_32bit = result & 0xFFFFFFFF
-        self.cpsr['N'] = 1 if (result_32bit >> 31) & 0x1 else 0  # Check MSB for negative
-        self.cpsr['Z'] = 1 if result_32bit == 0 else 0
-        if carry_out is not None:
-            self.cpsr['C'] = 1 if carry_out else 0
-        if overflow is not None:
-            self.cpsr['V'] = 1 if overflow else 0
+        self.registers = [0] * 16  # R0-R15, R15 is PC; plain ints masked to 32 bits on store
+        self.cpsr = 0  # NZCV packed into bits 31..28, see N_BIT/Z_BIT/C_BIT/V_BIT
+        self.memory = np.zeros(1024, dtype=np.uint8)  # 1KB of memory for now
+        self._mem32 = self.memory.view('<u4')  # Little-endian word view for aligned accesses
+
+        # Handlers indexed by instruction type id; unsupported types fall through to _exec_unknown
+        self._handlers = [self._exec_unknown] * len(INSTRUCTION_TYPES)
+        self._handlers[INSTR_MOV] = self._exec_mov
+        self._handlers[INSTR_LDR] = self._exec_ldr
+        self._handlers[INSTR_STR] = self._exec_str
+        self._handlers[INSTR_ADD] = self._exec_add
+        self._handlers[INSTR_SUB] = self._exec_sub
+        self._handlers[INSTR_MUL] = self._exec_mul
+        self._handlers[INSTR_CMP] = self._exec_cmp
+        self._handlers[INSTR_AND] = self._exec_and
+        self._handlers[INSTR_ORR] = self._exec_orr
+        self._handlers[INSTR_SUBNE] = self._exec_subne
+        self._handlers[INSTR_ADDEQ] = self._exec_addeq
+        self._handlers[INSTR_LSL] = self._exec_shift
+        self._handlers[INSTR_LSR] = self._exec_shift
+        self._handlers[INSTR_ASR] = self._exec_shift
+        self._handlers[INSTR_ROR] = self._exec_shift
+        self._handlers[INSTR_B] = self._exec_branch
+        self._handlers[INSTR_BL] = self._exec_branch
+        self._handlers[INSTR_CMP_SUBNE] = self._exec_cmp_subne
+        self._handlers[INSTR_CMP_ADDEQ] = self._exec_cmp_addeq
+
+    def _update_nz(self, result):
+        # Logical results only touch N and Z; C and V keep their previous values.
+        # result is already masked to 32 bits, so its MSB lands directly on N_BIT.
+        self.cpsr = (self.cpsr & (C_BIT | V_BIT)) | (result & N_BIT) | (Z_BIT if result == 0 else 0)
+
+    def _update_flags(self, result, carry_out, overflow):
+        self.cpsr = ((result & N_BIT)
+                     | (Z_BIT if result == 0 else 0)
+                     | (C_BIT if carry_out else 0)
+                     | (V_BIT if overflow else 0))
+
+    @staticmethod
+    def _add_flags(a, b, wide):
+        # (carry, overflow) for a + b, given the unmasked sum: carry out of bit 31,
+        # or operands of equal sign giving a result of the other
+        return wide > 0xFFFFFFFF, (~(a ^ b) & (a ^ wide) & N_BIT) != 0
+
+    @staticmethod
+    def _sub_flags(a, b, result):
+        # (carry, overflow) for a - b: carry means no borrow, overflow means operands of different sign
+        # giving a result whose sign differs from a
+        return a >= b, ((a ^ b) & (a ^ result) & N_BIT) != 0
 
     def _get_operand2(self, instruction):
-        if 'operand2' in instruction.operands: # Immediate operand
-            return instruction.operands['operand2']
-        elif 'rm' in instruction.operands: # Register operand (possibly shifted)
-            rm_value = self.registers[instruction.operands['rm']]
-            
-            shift_type = instruction.operands.get('shift_type')
-            shift_amount = instruction.operands.get('shift_amount')
-            rs = instruction.operands.get('rs')
-
-            if shift_type is not None:
-                if shift_amount is not None: # Immediate shift amount
-                    actual_shift_amount = shift_amount
-                elif rs is not None: # Register-specified shift amount
-                    actual_shift_amount = self.registers[rs]
-                else:
-                    actual_shift_amount = 0 # No shift amount specified, default to 0
-
-                # Ensure shift amount is within 0-31 for 32-bit registers
-                actual_shift_amount &= 0x1F
-
-                if shift_type == 0b00: # LSL
-                    return rm_value << actual_shift_amount
-                elif shift_type == 0b01: # LSR
-                    return rm_value >> actual_shift_amount
-                elif shift_type == 0b10: # ASR
-                    # ASR preserves the sign bit
-                    # Python's >> operator for negative numbers performs arithmetic shift right
-                    # For positive numbers, it's logical shift right
-                    # So, we need to handle this carefully for 32-bit signed integers
-                    if rm_value & 0x80000000: # If MSB is 1 (negative number)
-                        # Convert to signed 32-bit for ASR
-                        signed_rm_value = struct.unpack('<i', struct.pack('<I', rm_value & 0xFFFFFFFF))[0]
-                        return (signed_rm_value >> actual_shift_amount) & 0xFFFFFFFF
-                    else:
-                        return rm_value >> actual_shift_amount
-                elif shift_type == 0b11: # ROR
-                    # ROR: (value >> shift) | (value << (32 - shift))
-                    # The result should be masked to 32 bits
-                    return ((rm_value >> actual_shift_amount) | (rm_value << (32 - actual_shift_amount))) & 0xFFFFFFFF
-                else:
-                    return rm_value # Should not happen if shift_type is correctly decoded
-            else:
-                return rm_value # No shift specified, just return register value
-        else:
-            return 0 # Default or error case
+        shift_kind = instruction.shift_kind
+        if shift_kind == SHIFT_NONE: # Immediate operand
+            return instruction.operand2
+        rm_value = self.registers[instruction.rm]
+        if shift_kind == SHIFT_REGISTER: # Shift amount comes from Rs, masked to 0-31
+            return _SHIFTS[instruction.shift_type](rm_value, self.registers[instruction.rs] & 0x1F)
+        return _SHIFTS[shift_kind - SHIFT_LSL_IMM](rm_value, instruction.shift_amount)
 
     def execute_instruction(self, instruction):
-        # Condition check (simplified: only checks Z flag for EQ/NE)
-        execute_conditionally = True
-        if instruction.condition_code == 0b0001: # NE
-            if self.cpsr['Z'] == 1:
-                execute_conditionally = False
-        elif instruction.condition_code == 0b0000: # EQ
-            if self.cpsr['Z'] == 0:
-                execute_conditionally = False
-
-        if not execute_conditionally:
-            print(f"Instruction {instruction.instruction_type} skipped due to condition.")
+        if not _CONDITION_CHECKS[instruction.condition_code](self.cpsr):
+            log.debug("Instruction %s skipped due to condition.", instruction.instruction_type)
             return
 
-        if instruction.instruction_type == 'MOV':
-            rd = instruction.operands['rd']
-            operand2 = self._get_operand2(instruction)
-            self.registers[rd] = operand2 & 0xFFFFFFFF # Mask to 32 bits
-            if instruction.set_flags:
-                self._update_flags(operand2)
-        elif instruction.instruction_type == 'LDR':
-            rd = instruction.operands['rd']
-            rn = instruction.operands['rn']
-            offset = instruction.operands['offset']
-            address = self.registers[rn] + offset
-            if 0 <= address < len(self.memory) - 3:
-                value = struct.unpack('<I', self.memory[address:address+4])[0]
-                self.registers[rd] = value
+        self._handlers[instruction.type_id](instruction)
+
+    def execute_stream(self, instructions):
+        # Execute instructions as they are pulled from an iterable, e.g. arm_decoder.decode_stream
+        for instruction in instructions:
+            self.execute_instruction(instruction)
+
+    def execute_compiled(self, program):
+        # Run a DecodedProgram through the Cython core in arm_executor_fast.pyx, copying the CPU state
+        # in and out around the run. Build the extension first with `cythonize -i arm_executor_fast.pyx`.
+        try:
+            import arm_executor_fast
+        except ImportError as error:
+            raise ImportError("arm_executor_fast is not built; run `cythonize -i arm_executor_fast.pyx` "
+                              "in the arm_simulator directory") from error
+
+        # The core copies registers through a uint32 array
+        registers = np.array(self.registers, dtype=np.uint32)
+        core = arm_executor_fast.ARMCore()
+        core.load_state(registers, self.cpsr, self.memory)
+        core.execute_batch(arm_executor_fast.pack_program(program.fields))
+        core.store_state(registers, self.memory)
+        self.registers[:] = registers.tolist()
+        self.cpsr = core.cpsr
+
+    def _exec_mov(self, instruction):
+        rd = instruction.rd
+        operand2 = self._get_operand2(instruction)
+        self.registers[rd] = operand2
+        if instruction.set_flags:
+            self._update_nz(operand2)
+
+    def _exec_ldr(self, instruction):
+        rd = instruction.rd
+        rn = instruction.rn
+        offset = instruction.offset
+        address = self.registers[rn] + offset
+        if 0 <= address < len(self.memory) - 3:
+            if address & 3 == 0:
+                self.registers[rd] = int(self._mem32[address >> 2])
             else:
-                print(f"Memory access out of bounds for LDR at address {address}")
-        elif instruction.instruction_type == 'STR':
-            rd = instruction.operands['rd']
-            rn = instruction.operands['rn']
-            offset = instruction.operands['offset']
-            address = self.registers[rn] + offset
-            value = self.registers[rd]
-            if 0 <= address < len(self.memory) - 3:
-                self.memory[address:address+4] = struct.pack('<I', value)
+                self.registers[rd] = int.from_bytes(self.memory[address:address+4], 'little')
+        else:
+            log.warning("Memory access out of bounds for LDR at address %s", address)
+
+    def _exec_str(self, instruction):
+        rd = instruction.rd
+        rn = instruction.rn
+        offset = instruction.offset
+        address = self.registers[rn] + offset
+        value = self.registers[rd]
+        if 0 <= address < len(self.memory) - 3:
+            if address & 3 == 0:
+                self._mem32[address >> 2] = value
             else:
-                print(f"Memory access out of bounds for STR at address {address}")
-        elif instruction.instruction_type == 'ADD':
-            rd = instruction.operands['rd']
-            rn = instruction.operands['rn']
-            operand2 = self._get_operand2(instruction)
-            val_rn = self.registers[rn]
-            result = val_rn + operand2
-            self.registers[rd] = result & 0xFFFFFFFF # Mask to 32 bits
-            if instruction.set_flags:
-                # Carry out for addition: if result > 2^32 - 1
-                carry_out = (result > 0xFFFFFFFF)
-                # Overflow for addition: (Rn_sign == Op2_sign) and (Rn_sign != Result_sign)
-                # Sign bit is MSB (bit 31)
-                rn_sign = (val_rn >> 31) & 0x1
-                op2_sign = (operand2 >> 31) & 0x1
-                result_sign = (result >> 31) & 0x1
-                overflow = (rn_sign == op2_sign) and (rn_sign != result_sign)
-                self._update_flags(result, carry_out=carry_out, overflow=overflow)
-        elif instruction.instruction_type == 'SUB':
-            rd = instruction.operands['rd']
-            rn = instruction.operands['rn']
-            operand2 = self._get_operand2(instruction)
-            val_rn = self.registers[rn]
-            result = val_rn - operand2
-            self.registers[rd] = result & 0xFFFFFFFF # Mask to 32 bits
-            if instruction.set_flags:
-                # Carry out for subtraction: if no borrow (Rn >= Op2)
-                carry_out = (val_rn >= operand2)
-                # Overflow for subtraction: (Rn_sign != Op2_sign) and (Rn_sign != Result_sign)
-                rn_sign = (val_rn >> 31) & 0x1
-                op2_sign = (operand2 >> 31) & 0x1
-                result_sign = (result >> 31) & 0x1
-                overflow = (rn_sign != op2_sign) and (rn_sign != result_sign)
-                self._update_flags(result, carry_out=carry_out, overflow=overflow)
-        elif instruction.instruction_type == 'MUL':
-            rd = instruction.operands['rd']
-            rm = instruction.operands['rm']
-            rs = instruction.operands['rs']
-            result = self.registers[rm] * self.registers[rs]
-            self.registers[rd] = result & 0xFFFFFFFF # Mask to 32 bits
-            if instruction.set_flags:
-                self._update_flags(result)
-        elif instruction.instruction_type == 'AND':
-            rd = instruction.operands['rd']
-            rn = instruction.operands['rn']
-            operand2 = self._get_operand2(instruction)
-            result = self.registers[rn] & operand2
-            self.registers[rd] = result & 0xFFFFFFFF # Mask to 32 bits
-            if instruction.set_flags:
-                self._update_flags(result)
-        elif instruction.instruction_type == 'ORR':
-            rd = instruction.operands['rd']
-            rn = instruction.operands['rn']
-            operand2 = self._get_operand2(instruction)
-            result = self.registers[rn] | operand2
-            self.registers[rd] = result & 0xFFFFFFFF # Mask to 32 bits
-            if instruction.set_flags:
-                self._update_flags(result)
-        elif instruction.instruction_type == 'CMP':
-            rn = instruction.operands['rn']
-            operand2 = self._get_operand2(instruction)
-            val_rn = self.registers[rn]
-            result = val_rn - operand2
-            # Carry out for subtraction: if no borrow (Rn >= Op2)
-            carry_out = (val_rn >= operand2)
-            # Overflow for subtraction: (Rn_sign != Op2_sign) and (Rn_sign != Result_sign)
-            rn_sign = (val_rn >> 31) & 0x1
-            op2_sign = (operand2 >> 31) & 0x1
-            result_sign = (result >> 31) & 0x1
-            overflow = (rn_sign != op2_sign) and (rn_sign != result_sign)
-            self._update_flags(result, carry_out=carry_out, overflow=overflow)
-        elif instruction.instruction_type == 'SUBNE':
-            rd = instruction.operands['rd']
-            rn = instruction.operands['rn']
-            operand2 = self._get_operand2(instruction)
-            val_rn = self.registers[rn]
-            result = val_rn - operand2
-            self.registers[rd] = result & 0xFFFFFFFF # Mask to 32 bits
-            if instruction.set_flags:
-                carry_out = (val_rn >= operand2)
-                rn_sign = (val_rn >> 31) & 0x1
-                op2_sign = (operand2 >> 31) & 0x1
-                result_sign = (result >> 31) & 0x1
-                overflow = (rn_sign != op2_sign) and (rn_sign != result_sign)
-                self._update_flags(result, carry_out=carry_out, overflow=overflow)
-        elif instruction.instruction_type == 'ADDEQ':
-            rd = instruction.operands['rd']
-            rn = instruction.operands['rn']
-            operand2 = self._get_operand2(instruction)
-            val_rn = self.registers[rn]
-            result = val_rn + operand2
-            self.registers[rd] = result & 0xFFFFFFFF # Mask to 32 bits
-            if instruction.set_flags:
-                carry_out = (result > 0xFFFFFFFF)
-                rn_sign = (val_rn >> 31) & 0x1
-                op2_sign = (operand2 >> 31) & 0x1
-                result_sign = (result >> 31) & 0x1
-                overflow = (rn_sign == op2_sign) and (rn_sign != result_sign)
-                self._update_flags(result, carry_out=carry_out, overflow=overflow)
-        elif instruction.instruction_type == 'LSL':
-            rd = instruction.operands['rd']
-            shifted_value = self._get_operand2(instruction)
-            self.registers[rd] = shifted_value & 0xFFFFFFFF # Mask to 32 bits
-            if instruction.set_flags:
-                self._update_flags(shifted_value)
-        elif instruction.instruction_type == 'LSR':
-            rd = instruction.operands['rd']
-            shifted_value = self._get_operand2(instruction)
-            self.registers[rd] = shifted_value & 0xFFFFFFFF # Mask to 32 bits
-            if instruction.set_flags:
-                self._update_flags(shifted_value)
-        elif instruction.instruction_type == 'ASR':
-            rd = instruction.operands['rd']
-            shifted_value = self._get_operand2(instruction)
-            self.registers[rd] = shifted_value & 0xFFFFFFFF # Mask to 32 bits
-            if instruction.set_flags:
-                self._update_flags(shifted_value)
-        elif instruction.instruction_type == 'ROR':
-            rd = instruction.operands['rd']
-            shifted_value = self._get_operand2(instruction)
-            self.registers[rd] = shifted_value & 0xFFFFFFFF # Mask to 32 bits
-            if instruction.set_flags:
-                self._update_flags(shifted_value)
-        elif instruction.instruction_type == 'B' or instruction.instruction_type == 'BL':
-            print(f"Branch instruction {instruction.instruction_type} with offset {instruction.operands['offset']}")
+                self.memory[address:address+4] = np.frombuffer(value.to_bytes(4, 'little'), dtype=np.uint8)
+        else:
+            log.warning("Memory access out of bounds for STR at address %s", address)
+
+    def _exec_add(self, instruction):
+        rd = instruction.rd
+        rn = instruction.rn
+        operand2 = self._get_operand2(instruction)
+        val_rn = self.registers[rn]
+        # Keep the unmasked sum for the carry out of bit 31
+        wide = val_rn + operand2
+        result = wide & 0xFFFFFFFF
+        self.registers[rd] = result
+        if instruction.set_flags:
+            self._update_flags(result, *self._add_flags(val_rn, operand2, wide))
+
+    def _exec_sub(self, instruction):
+        rd = instruction.rd
+        rn = instruction.rn
+        operand2 = self._get_operand2(instruction)
+        val_rn = self.registers[rn]
+        result = (val_rn - operand2) & 0xFFFFFFFF
+        self.registers[rd] = result
+        if instruction.set_flags:
+            self._update_flags(result, *self._sub_flags(val_rn, operand2, result))
+
+    def _exec_mul(self, instruction):
+        rd = instruction.rd
+        rm = instruction.rm
+        rs = instruction.rs
+        # The register keeps the low 32 bits of the product
+        result = (self.registers[rm] * self.registers[rs]) & 0xFFFFFFFF
+        self.registers[rd] = result
+        if instruction.set_flags:
+            self._update_nz(result)
+
+    def _exec_and(self, instruction):
+        rd = instruction.rd
+        rn = instruction.rn
+        operand2 = self._get_operand2(instruction)
+        result = self.registers[rn] & operand2
+        self.registers[rd] = result
+        if instruction.set_flags:
+            self._update_nz(result)
+
+    def _exec_orr(self, instruction):
+        rd = instruction.rd
+        rn = instruction.rn
+        operand2 = self._get_operand2(instruction)
+        result = self.registers[rn] | operand2
+        self.registers[rd] = result
+        if instruction.set_flags:
+            self._update_nz(result)
+
+    def _exec_cmp(self, instruction):
+        rn = instruction.rn
+        operand2 = self._get_operand2(instruction)
+        val_rn = self.registers[rn]
+        result = (val_rn - operand2) & 0xFFFFFFFF
+        self._update_flags(result, *self._sub_flags(val_rn, operand2, result))
+
+    def _exec_subne(self, instruction):
+        rd = instruction.rd
+        rn = instruction.rn
+        operand2 = self._get_operand2(instruction)
+        val_rn = self.registers[rn]
+        result = (val_rn - operand2) & 0xFFFFFFFF
+        self.registers[rd] = result
+        if instruction.set_flags:
+            self._update_flags(result, *self._sub_flags(val_rn, operand2, result))
+
+    def _exec_addeq(self, instruction):
+        rd = instruction.rd
+        rn = instruction.rn
+        operand2 = self._get_operand2(instruction)
+        val_rn = self.registers[rn]
+        wide = val_rn + operand2
+        result = wide & 0xFFFFFFFF
+        self.registers[rd] = result
+        if instruction.set_flags:
+            self._update_flags(result, *self._add_flags(val_rn, operand2, wide))
+
+    def _exec_shift(self, instruction):
+        # LSL, LSR, ASR and ROR are all MOV Rd, Rm, <shift>
+        rd = instruction.rd
+        shifted_value = self._get_operand2(instruction)
+        self.registers[rd] = shifted_value
+        if instruction.set_flags:
+            self._update_nz(shifted_value)
+
+    def _exec_cmp_subne(self, instruction):
+        # Fused CMP + SUBNE: the SUB runs only if the compare just cleared Z
+        self._exec_cmp(instruction.compare)
+        if self.cpsr & Z_BIT == 0:
+            self._exec_subne(instruction.conditional)
         else:
-            print(f"Unknown instruction type for execution: {instruction.instruction_type}")
+            log.debug("Instruction %s skipped due to condition.", instruction.conditional.instruction_type)
+
+    def _exec_cmp_addeq(self, instruction):
+        # Fused CMP + ADDEQ: the ADD runs only if the compare just set Z
+        self._exec_cmp(instruction.compare)
+        if self.cpsr & Z_BIT != 0:
+            self._exec_addeq(instruction.conditional)
+        else:
+            log.debug("Instruction %s skipped due to condition.", instruction.conditional.instruction_type)
+
+    def _exec_branch(self, instruction):
+        log.info("Branch instruction %s with offset %s", instruction.instruction_type, instruction.offset)
+
+    def _exec_unknown(self, instruction):
+        log.warning("Unknown instruction type for execution: %s", instruction.instruction_type)
 
     def __str__(self):
-        reg_str = ", ".join([f"R{i}: {self.registers[i]:08X}" for i in range(16)])
-        cpsr_str = ", ".join([f"{k}: {v}" for k, v in self.cpsr.items()])
-        return f"Registers: {reg_str}\nCPSR: {cpsr_str}"
+        cpsr = self.cpsr
+        cpsr_str = self._CPSR_FMT.format(cpsr >> 31 & 1, cpsr >> 30 & 1, cpsr >> 29 & 1, cpsr >> 28 & 1)
+        return f"Registers: {self._REG_FMT.format(*self.registers)}\nCPSR: {cpsr_str}"
 
 
@@ -0,0 +1,235 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+# Compiled execution core for trace replay, driven by ARMCpu.execute_compiled; build it in place with
+# `cythonize -i arm_executor_fast.pyx`. It mirrors ARMCpu.execute_instruction but does not log
+# skipped, out-of-bounds or branch messages.
+
+from libc.stdint cimport uint8_t, uint32_t, int32_t, int64_t, uint64_t
+from libc.string cimport memcpy
+
+import numpy as np
+
+from arm_decoder import (
+    INSTR_MOV, INSTR_LDR, INSTR_STR, INSTR_ADD, INSTR_SUB, INSTR_MUL, INSTR_CMP, INSTR_AND, INSTR_ORR,
+    INSTR_SUBNE, INSTR_ADDEQ, INSTR_LSL, INSTR_LSR, INSTR_ASR, INSTR_ROR,
+    SHIFT_NONE, SHIFT_LSL_IMM, SHIFT_REGISTER,
+)
+
+cdef extern from *:
+    """
+    #define ARM_LIKELY(x) __builtin_expect(!!(x), 1)
+    """
+    bint ARM_LIKELY(bint) nogil
+
+# Type ids and shift kinds as C enums so the dispatch below compiles to a switch.
+# The values must match arm_decoder; this is checked when the module is imported.
+cdef enum:
+    T_MOV = 0
+    T_LDR = 1
+    T_STR = 2
+    T_ADD = 3
+    T_SUB = 4
+    T_MUL = 5
+    T_CMP = 6
+    T_AND = 7
+    T_ORR = 8
+    T_SUBNE = 9
+    T_ADDEQ = 10
+    T_LSL = 11
+    T_LSR = 12
+    T_ASR = 13
+    T_ROR = 14
+    K_NONE = 0
+    K_LSL_IMM = 1
+    K_REGISTER = 5
+
+for _c_value, _py_value in (
+        (T_MOV, INSTR_MOV), (T_LDR, INSTR_LDR), (T_STR, INSTR_STR), (T_ADD, INSTR_ADD), (T_SUB, INSTR_SUB),
+        (T_MUL, INSTR_MUL), (T_CMP, INSTR_CMP), (T_AND, INSTR_AND), (T_ORR, INSTR_ORR), (T_SUBNE, INSTR_SUBNE),
+        (T_ADDEQ, INSTR_ADDEQ), (T_LSL, INSTR_LSL), (T_LSR, INSTR_LSR), (T_ASR, INSTR_ASR), (T_ROR, INSTR_ROR),
+        (K_NONE, SHIFT_NONE), (K_LSL_IMM, SHIFT_LSL_IMM), (K_REGISTER, SHIFT_REGISTER)):
+    if _c_value != _py_value:
+        raise ImportError("arm_executor_fast is out of sync with the type ids in arm_decoder")
+
+# CPSR condition flag bits (bits 31..28)
+cdef uint32_t N_BIT = 1u << 31
+cdef uint32_t Z_BIT = 1u << 30
+cdef uint32_t C_BIT = 1u << 29
+cdef uint32_t V_BIT = 1u << 28
+
+cdef enum:
+    MEMORY_SIZE = 1024
+
+cdef packed struct Instr:
+    uint8_t type_id
+    uint8_t cond
+    uint8_t rd
+    uint8_t rn
+    uint8_t rm
+    uint8_t rs
+    uint8_t shift_type
+    uint8_t shift_kind
+    uint8_t shift_amount
+    uint8_t set_flags
+    uint32_t operand2
+    uint32_t offset
+
+# numpy layout of Instr, used by pack_program
+INSTR_DTYPE = np.dtype([
+    ('type_id', 'u1'), ('cond', 'u1'), ('rd', 'u1'), ('rn', 'u1'), ('rm', 'u1'), ('rs', 'u1'),
+    ('shift_type', 'u1'), ('shift_kind', 'u1'), ('shift_amount', 'u1'), ('set_flags', 'u1'),
+    ('operand2', 'u4'), ('offset', 'u4'),
+])
+
+def pack_program(fields):
+    # Pack the field arrays of a DecodedProgram into Instr records; unused (-1) fields become 0
+    instrs = np.zeros(len(fields['type_id']), dtype=INSTR_DTYPE)
+    for name in INSTR_DTYPE.names:
+        instrs[name] = np.maximum(fields[name], 0)
+    return instrs
+
+cdef inline bint _condition_passes(uint32_t cpsr, uint8_t cond) noexcept nogil:
+    cdef bint n = (cpsr & N_BIT) != 0
+    cdef bint z = (cpsr & Z_BIT) != 0
+    cdef bint c = (cpsr & C_BIT) != 0
+    cdef bint v = (cpsr & V_BIT) != 0
+    if cond == 0b0000: return z             # EQ
+    elif cond == 0b0001: return not z       # NE
+    elif cond == 0b0010: return c           # CS/HS
+    elif cond == 0b0011: return not c       # CC/LO
+    elif cond == 0b0100: return n           # MI
+    elif cond == 0b0101: return not n       # PL
+    elif cond == 0b0110: return v           # VS
+    elif cond == 0b0111: return not v       # VC
+    elif cond == 0b1000: return c and not z # HI
+    elif cond == 0b1001: return not c or z  # LS
+    elif cond == 0b1010: return n == v      # GE
+    elif cond == 0b1011: return n != v      # LT
+    elif cond == 0b1100: return not z and n == v # GT
+    elif cond == 0b1101: return z or n != v # LE
+    return True                             # AL, 1111 (unconditional)
+
+cdef inline uint32_t _shift(uint32_t value, uint8_t shift_type, uint32_t amount) noexcept nogil:
+    if shift_type == 0b00: # LSL
+        return value << amount
+    elif shift_type == 0b01: # LSR
+        return value >> amount
+    elif shift_type == 0b10: # ASR
+        return <uint32_t>((<int32_t>value) >> amount)
+    if amount == 0: # ROR by 0 leaves the value unchanged (a 32-bit shift is undefined in C)
+        return value
+    return (value >> amount) | (value << (32 - amount))
+
+cdef class ARMCore:
+    cdef uint32_t registers[16]
+    cdef public uint32_t cpsr
+    cdef uint8_t memory[MEMORY_SIZE]
+
+    def load_state(self, const uint32_t[::1] registers, uint32_t cpsr, const uint8_t[::1] memory):
+        memcpy(self.registers, &registers[0], 16 * sizeof(uint32_t))
+        self.cpsr = cpsr
+        memcpy(self.memory, &memory[0], MEMORY_SIZE)
+
+    def store_state(self, uint32_t[::1] registers, uint8_t[::1] memory):
+        # Copy registers and memory back into the caller's arrays; cpsr is read from the attribute
+        memcpy(&registers[0], self.registers, 16 * sizeof(uint32_t))
+        memcpy(&memory[0], self.memory, MEMORY_SIZE)
+
+    cdef inline uint32_t _operand2(self, const Instr* instr) noexcept nogil:
+        if instr.shift_kind == K_NONE: # Immediate operand
+            return instr.operand2
+        cdef uint32_t rm_value = self.registers[instr.rm]
+        if instr.shift_kind == K_REGISTER: # Shift amount comes from Rs, masked to 0-31
+            return _shift(rm_value, instr.shift_type, self.registers[instr.rs] & 0x1F)
+        return _shift(rm_value, instr.shift_kind - K_LSL_IMM, instr.shift_amount)
+
+    cdef inline void _update_nz(self, uint32_t result) noexcept nogil:
+        self.cpsr = (self.cpsr & (C_BIT | V_BIT)) | (result & N_BIT) | (Z_BIT if result == 0 else 0)
+
+    cdef inline void _update_flags(self, uint32_t result, bint carry_out, bint overflow) noexcept nogil:
+        self.cpsr = ((result & N_BIT)
+                     | (Z_BIT if result == 0 else 0)
+                     | (C_BIT if carry_out else 0)
+                     | (V_BIT if overflow else 0))
+
+    cdef inline void _add(self, const Instr* instr) noexcept nogil:
+        cdef uint32_t val_rn = self.registers[instr.rn]
+        cdef uint32_t operand2 = self._operand2(instr)
+        cdef uint64_t wide = <uint64_t>val_rn + operand2
+        cdef uint32_t result = <uint32_t>wide
+        self.registers[instr.rd] = result
+        if instr.set_flags:
+            self._update_flags(result, wide > 0xFFFFFFFFu,
+                               (~(val_rn ^ operand2) & (val_rn ^ result) & N_BIT) != 0)
+
+    cdef inline void _sub(self, const Instr* instr, bint write) noexcept nogil:
+        # SUB/SUBNE write Rd; CMP only sets the flags
+        cdef uint32_t val_rn = self.registers[instr.rn]
+        cdef uint32_t operand2 = self._operand2(instr)
+        cdef uint32_t result = val_rn - operand2
+        if write:
+            self.registers[instr.rd] = result
+        if instr.set_flags or not write:
+            self._update_flags(result, val_rn >= operand2,
+                               ((val_rn ^ operand2) & (val_rn ^ result) & N_BIT) != 0)
+
+    cdef inline void _load(self, const Instr* instr) noexcept nogil:
+        cdef int64_t address = <int64_t>self.registers[instr.rn] + instr.offset
+        if 0 <= address < MEMORY_SIZE - 3:
+            self.registers[instr.rd] = (self.memory[address]
+                                        | (<uint32_t>self.memory[address + 1] << 8)
+                                        | (<uint32_t>self.memory[address + 2] << 16)
+                                        | (<uint32_t>self.memory[address + 3] << 24))
+
+    cdef inline void _store(self, const Instr* instr) noexcept nogil:
+        cdef int64_t address = <int64_t>self.registers[instr.rn] + instr.offset
+        cdef uint32_t value = self.registers[instr.rd]
+        if 0 <= address < MEMORY_SIZE - 3:
+            self.memory[address] = value & 0xFF
+            self.memory[address + 1] = (value >> 8) & 0xFF
+            self.memory[address + 2] = (value >> 16) & 0xFF
+            self.memory[address + 3] = (value >> 24) & 0xFF
+
+    def execute_batch(self, const Instr[:] instrs):
+        cdef Py_ssize_t i
+        cdef const Instr* instr
+        cdef uint8_t type_id
+        cdef uint32_t result
+        with nogil:
+            for i in range(instrs.shape[0]):
+                instr = &instrs[i]
+                if not ARM_LIKELY(instr.cond == 0b1110 or _condition_passes(self.cpsr, instr.cond)):
+                    continue
+
+                # Every branch is an equality test on the enum constants, so Cython emits one C switch
+                type_id = instr.type_id
+                if type_id == T_MOV or type_id == T_LSL or type_id == T_LSR or type_id == T_ASR or type_id == T_ROR:
+                    result = self._operand2(instr)
+                    self.registers[instr.rd] = result
+                    if instr.set_flags:
+                        self._update_nz(result)
+                elif type_id == T_ADD or type_id == T_ADDEQ:
+                    self._add(instr)
+                elif type_id == T_SUB or type_id == T_SUBNE:
+                    self._sub(instr, True)
+                elif type_id == T_CMP:
+                    self._sub(instr, False)
+                elif type_id == T_AND:
+                    result = self.registers[instr.rn] & self._operand2(instr)
+                    self.registers[instr.rd] = result
+                    if instr.set_flags:
+                        self._update_nz(result)
+                elif type_id == T_ORR:
+                    result = self.registers[instr.rn] | self._operand2(instr)
+                    self.registers[instr.rd] = result
+                    if instr.set_flags:
+                        self._update_nz(result)
+                elif type_id == T_MUL:
+                    result = self.registers[instr.rm] * self.registers[instr.rs]
+                    self.registers[instr.rd] = result
+                    if instr.set_flags:
+                        self._update_nz(result)
+                elif type_id == T_LDR:
+                    self._load(instr)
+                elif type_id == T_STR:
+                    self._store(instr)
+                # Branches and unknown instructions have no architectural effect here
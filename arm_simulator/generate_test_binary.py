@@ -100,9 +100,10 @@ def generate_test_binary(output_file):
         instr11_bin, instr12_bin, instr13_bin, instr14_bin, instr15_bin
     ]
 
+    # Pack all words at once as big-endian (network byte order) and write them in one call
+    payload = struct.pack(f">{len(binary_words)}I", *binary_words)
     with open(output_file, "wb") as f:
-        for word in binary_words:
-            f.write(struct.pack(">I", word)) # Write as big-endian (network byte order)
+        f.write(payload)
 
     print(f"Generated test binary file: {output_file}")
 
@@ -1,8 +1,15 @@
+import logging
 import struct
-from arm_decoder import decode_instructions, ARMInstruction, ThumbInstruction
+from arm_decoder import decode_stream, ARMInstruction, ThumbInstruction
 from arm_executor import ARMCpu
 
+def read_chunks(f, chunk_size=4096):
+    while chunk := f.read(chunk_size):
+        yield chunk
+
 def run_simulation(binary_file_path):
+    # Show branch and warning messages from the executor; skipped instructions are DEBUG
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     cpu = ARMCpu()
     
     # Initialize some registers for testing purposes
@@ -20,21 +27,20 @@ def run_simulation(binary_file_path):
     print("-------------------------")
 
     try:
-        with open(binary_file_path, "rb") as f:
-            binary_data = f.read()
+        f = open(binary_file_path, "rb")
     except FileNotFoundError:
         print(f"Error: Binary file not found at {binary_file_path}")
         return
 
-    instructions = decode_instructions(binary_data)
-
-    for i, instruction in enumerate(instructions):
-        print(f"\n--- Executing Instruction {i+1} ---")
-        print(f"Decoded: {instruction}")
-        cpu.execute_instruction(instruction)
-        print("--- CPU State After Execution ---")
-        print(cpu)
-        print("---------------------------------")
+    # Decode while executing: instructions are pulled from the file a chunk at a time
+    with f:
+        for i, instruction in enumerate(decode_stream(read_chunks(f))):
+            print(f"\n--- Executing Instruction {i+1} ---")
+            print(f"Decoded: {instruction}")
+            cpu.execute_instruction(instruction)
+            print("--- CPU State After Execution ---")
+            print(cpu)
+            print("---------------------------------")
 
 if __name__ == "__main__":
     run_simulation("test_instructions.bin")
@@ -0,0 +1,78 @@
+import importlib
+import os
+import random
+import shutil
+import struct
+import subprocess
+import sys
+
+import pytest
+
+import arm_executor
+from arm_decoder import DecodedProgram
+from arm_executor import ARMCpu
+
+pytest.importorskip('Cython')
+
+@pytest.fixture(scope='module')
+def fast_module(tmp_path_factory):
+    # Build arm_executor_fast in a temporary directory so the source tree stays clean
+    build_dir = tmp_path_factory.mktemp('arm_executor_fast')
+    source = os.path.join(os.path.dirname(arm_executor.__file__), 'arm_executor_fast.pyx')
+    shutil.copy(source, build_dir)
+    subprocess.run([sys.executable, '-m', 'Cython.Build.Cythonize', '-i', 'arm_executor_fast.pyx'],
+                   cwd=build_dir, check=True, capture_output=True)
+    sys.path.insert(0, str(build_dir))
+    try:
+        yield importlib.import_module('arm_executor_fast')
+    finally:
+        sys.path.remove(str(build_dir))
+        sys.modules.pop('arm_executor_fast', None)
+
+def _random_words(rng, count):
+    # Unconditional data processing, multiply and load/store words mixed with fully random ones
+    words = []
+    for _ in range(count):
+        kind = rng.randrange(4)
+        if kind == 0:
+            word = rng.getrandbits(32)
+        elif kind == 1: # Data processing with a random condition, operand form and shift
+            word = (rng.randrange(16) << 28) | rng.getrandbits(26)
+        elif kind == 2: # MUL/MULS Rd, Rm, Rs
+            word = 0xE0000090 | (rng.randrange(2) << 20) | (rng.randrange(16) << 16) | (rng.randrange(16) << 8) | rng.randrange(16)
+        else: # LDR/STR Rd, [Rn, #offset]
+            word = 0xE4000000 | (rng.randrange(2) << 20) | (rng.getrandbits(8) << 12) | rng.randrange(64)
+        words.append(word)
+    return words
+
+def _random_registers(rng):
+    # Mix small values, usable as memory addresses, with edge cases and full-width values
+    return [rng.choice([rng.getrandbits(32), rng.randrange(960), 0, 0x80000000, 0xFFFFFFFF]) for _ in range(16)]
+
+def _cpu(registers, cpsr):
+    cpu = ARMCpu()
+    for i, value in enumerate(registers):
+        cpu.registers[i] = value
+    cpu.cpsr = cpsr
+    return cpu
+
+def _state(cpu):
+    return [int(value) for value in cpu.registers], cpu.cpsr, bytes(cpu.memory)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_compiled_core_matches_interpreter(fast_module, seed):
+    # Many short programs, so the registers do not settle into zeros before the comparison
+    rng = random.Random(seed)
+    for _ in range(100):
+        words = _random_words(rng, 20)
+        program = DecodedProgram(struct.pack(f'>{len(words)}I', *words))
+        registers = _random_registers(rng)
+        cpsr = rng.randrange(16) << 28
+
+        interpreted = _cpu(registers, cpsr)
+        for instruction in program:
+            interpreted.execute_instruction(instruction)
+        compiled = _cpu(registers, cpsr)
+        compiled.execute_compiled(program)
+
+        assert _state(compiled) == _state(interpreted), [str(instruction) for instruction in program]